@@ -24,6 +24,8 @@
 """
 
 import os
+import collections
+from copy import deepcopy
 
 import maya.cmds as cmds
 
@@ -47,6 +49,18 @@ KATANA_NODE_WIDTH = 200
 KATANA_SPACE_WIDTH = 60
 KATANA_ROW_HEIGHT = 100
 
+# Mapping dictionary keys that are not node parameters
+MAPPING_KEYWORDS = ("customProcess", "customColor", "customMapping")
+
+# Decoded mapping dictionary value, see compile_mapping()
+MappingRule = collections.namedtuple(
+    "MappingRule", ["dest_key", "rename", "options", "process", "children"]
+)
+# Compiled mapping dictionary: parameter rules and the keyword options
+NodeMapping = collections.namedtuple(
+    "NodeMapping", ["rules", "custom_mapping", "custom_process", "custom_color"]
+)
+
 
 def equal_attributes(a, b):
     """
@@ -92,56 +106,122 @@ def equal_attributes(a, b):
         return a == b
 
 
-def iterate_mapping_recursive(mapping_dict, xml_group, node):
+def compile_mapping(mapping_dict):
+    """
+    Decode the mapping dictionary values once
+    so that iterate_mapping_recursive doesn't need to
+    inspect their types for every node.
+    The mapping values are:
+    - None: the parameter is copied as is
+    - string: Katana parameter name (the connection is renamed too)
+    - list: enum options
+    - callable: the function to process the value
+    - dictionary: child parameters, skipped if the value is zero
+    - tuple: Katana parameter name and one of the above
+    The keywords are moved to the NodeMapping fields.
+    The compiled rules are read-only and the enum options are tuples
+    """
+    rules = {}
+    for param_key, param_children in mapping_dict.items():
+        if param_key in MAPPING_KEYWORDS:
+            continue
+        if param_children is None:
+            rules[param_key] = None
+            continue
+        dest_key = param_key
+        rename = False
+        options = None
+        process = None
+        if isinstance(param_children, tuple):
+            dest_key, param_children = param_children
+        if isinstance(param_children, list):
+            options = tuple(param_children)
+            param_children = None
+        if isinstance(param_children, str):
+            dest_key = param_children
+            rename = True
+            param_children = None
+        if callable(param_children):
+            process = param_children
+            param_children = None
+        if param_children:
+            param_children = compile_mapping(param_children)
+        rules[param_key] = MappingRule(
+            dest_key, rename, options, process, param_children or None
+        )
+    return NodeMapping(
+        utils.MappingProxyType(rules),
+        # An empty mapping dictionary is built from the node attributes
+        bool(mapping_dict) and bool(mapping_dict.get("customMapping", True)),
+        mapping_dict.get("customProcess"),
+        mapping_dict.get("customColor"),
+    )
+
+
+def get_mapping(mappings, node_type):
+    """
+    Compile the node type mapping on its first use during the conversion
+    """
+    compiled_mappings = utils.get_cache("mappings")
+    if node_type not in compiled_mappings:
+        mapping = mappings.get(node_type)
+        if mapping is not None:
+            mapping = compile_mapping(mapping)
+        compiled_mappings[node_type] = mapping
+    return compiled_mappings[node_type]
+
+
+def index_parameters(xml_group):
+    """
+    Index the Katana node parameter groups by name.
+    The first group in document order wins as it would with find()
+    """
+    parameters = {}
+    for group in xml_group.iterfind(".//group_parameter[@name='parameters']"):
+        for parameter in group.iter("group_parameter"):
+            if parameter is not group:
+                parameters.setdefault(parameter.get("name"), parameter)
+    return parameters
+
+
+def iterate_mapping_recursive(mapping, xml_group, node, parameters=None):
     """
     The most complicated part that maps
     Maya parameters to Katana XML parameters
     """
     attributes = node["attributes"]
-    mapping = dict(mapping_dict)
-    if not mapping or not mapping.get("customMapping", True):
+    rules = mapping.rules
+    if not mapping.custom_mapping:
         # If we know that the node has identical attributes
         # in both Maya and Katana, then we don't need the mapping dictionary,
         # we can build it on-the-fly from Maya node attributes
         attr_dict = dict.fromkeys(attributes)
-        attr_dict.update(mapping)
-        mapping = attr_dict
+        attr_dict.update(rules)
+        rules = attr_dict
     # Special case: custom processing (used for ramp, etc.)
-    custom_option = mapping.pop("customProcess", None)
+    custom_option = mapping.custom_process
     if custom_option:
         custom_option(xml_group, node)
-    custom_option = mapping.pop("customColor", None)
+    custom_option = mapping.custom_color
     if custom_option:
         xml_group.attrib["ns_colorr"] = str(custom_option[0])
         xml_group.attrib["ns_colorg"] = str(custom_option[1])
         xml_group.attrib["ns_colorb"] = str(custom_option[2])
-    for param_key, param_children in mapping.items():
-        options = None
-        process_field = None
+    if parameters is None:
+        parameters = index_parameters(xml_group)
+    for param_key, rule in rules.items():
         force_continue = False
-        dest_key = param_key
-        if isinstance(param_children, tuple):
-            dest_key = param_children[0]
-            param_children = param_children[1]
-        if isinstance(param_children, list):
-            options = param_children
-            param_children = None
-        if isinstance(param_children, str):
-            dest_key = param_children
-            param_children = None
-            connections = node["connections"]
-            for connection_name, connection in connections.items():
-                if connection_name == param_key:
+        if rule is None:
+            dest_key = param_key
+            options = process_field = param_children = None
+        else:
+            dest_key, rename, options, process_field, param_children = rule
+            if rename:
+                connections = node["connections"]
+                connection = connections.pop(param_key, None)
+                if connection is not None:
                     connections[dest_key] = connection
-                    connections.pop(connection_name)
-                    break
-        if callable(param_children):
-            process_field = param_children
-            param_children = None
-        parameter = xml_group.find(
-            ".//group_parameter[@name='parameters']"
-            "//group_parameter[@name='{param}']".format(param=dest_key)
-        )
+        parameter = parameters.get(dest_key)
         # print param_key, dest_key, node
         if parameter is not None:
             enable_node = parameter.find("*[@name='enable']")
@@ -223,10 +303,18 @@ def iterate_mapping_recursive(mapping_dict, xml_group, node):
                     param_children = None
         if param_children:
             # if param_children is not None
-            iterate_mapping_recursive(param_children, xml_group, node)
+            iterate_mapping_recursive(param_children, xml_group, node, parameters)
+
+
+def get_node_types(node_names):
+    """
+    Get the types of all the nodes with a single Maya query
+    """
+    node_types = cmds.ls(node_names, showType=True) or []
+    return dict(zip(node_types[::2], node_types[1::2]))
 
 
-def preprocess_node(node_name, premap):
+def preprocess_node(node_name, premap, node_type=None):
     """
     Preprocessing a node.
     This is needed as some nodes (like ramp or bump) can be
@@ -234,11 +322,12 @@ def preprocess_node(node_name, premap):
     We return either one original node or several
     nodes if something was replaced during preprocessing
     """
-    node_type = cmds.nodeType(node_name)
+    if not node_type:
+        node_type = cmds.nodeType(node_name)
     if node_type not in premap:
         return None
     nodes = {}
-    attributes = utils.node_attributes(node_name)
+    attributes = utils.node_attributes(node_name, node_type)
     connections = {}
     node_connections = cmds.listConnections(
         node_name, source=True, destination=False, connections=True, plugs=True
@@ -275,26 +364,54 @@ def preprocess_node(node_name, premap):
     return nodes
 
 
+def get_template_path(renderer, node_type):
+    """
+    Get the Katana XML template path for the node type
+    or None if there is no template.
+    Missing templates are remembered as well so that unsupported
+    node types don't hit the file system again during the conversion
+    """
+    template_paths = utils.get_cache("template_paths")
+    key = (renderer, node_type)
+    if key not in template_paths:
+        xml_path = os.path.join(
+            BASEDIR, "renderer", renderer, "nodes", node_type + ".xml"
+        )
+        template_paths[key] = xml_path if os.path.isfile(xml_path) else None
+    return template_paths[key]
+
+
+def get_template(xml_path):
+    """
+    Get a fresh copy of the Katana XML template.
+    Each template is parsed only once per conversion
+    """
+    templates = utils.get_cache("templates")
+    if xml_path not in templates:
+        templates[xml_path] = ET.parse(xml_path).getroot()
+    return deepcopy(templates[xml_path])
+
+
 def process_node(node, renderer, mappings):
     """
     Start individual node processing
     """
     if "name" not in node:
         return None
-    node_name = utils.strip_namespace(node["name"])
     node_type = node["type"]
-    if node_type not in mappings:
+    mapping = get_mapping(mappings, node_type)
+    if mapping is None:
         return None
-    xml_path = os.path.join(BASEDIR, "renderer", renderer, "nodes", node_type + ".xml")
-    if not os.path.isfile(xml_path) or mappings.get(node_type) is None:
+    xml_path = get_template_path(renderer, node_type)
+    if not xml_path:
         return None
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+    node_name = utils.strip_namespace(node["name"])
+    root = get_template(xml_path)
     root.attrib["name"] = node_name
     xml_node = root.find("./group_parameter/string_parameter[@name='name']")
     if xml_node is not None:
         xml_node.attrib["value"] = node_name
-    iterate_mapping_recursive(mappings[node_type], root, node)
+    iterate_mapping_recursive(mapping, root, node)
     return root
 
 
@@ -546,9 +663,15 @@ def generate_xml(node_names, renderer=None):
     # Collect the list of used node names to get unique names
     node_names = list(set(node_names))
     utils.unique_name(reset=node_names)
+    utils.reset_cache()
     preprocessed_nodes = {}
+    node_types = get_node_types(node_names)
     for node_name in node_names:
-        preprocessed_node = preprocess_node(node_name, premap=renderer_module.premap)
+        preprocessed_node = preprocess_node(
+            node_name,
+            premap=renderer_module.premap,
+            node_type=node_types.get(node_name),
+        )
         if preprocessed_node:
             preprocessed_nodes.update(preprocessed_node)
     utils.rename_connections(preprocessed_nodes)
@@ -23,23 +23,143 @@
     ------------------------------
 """
 
+import operator
 import re
-import os
 
 import maya.cmds as cmds
 
-from ... import utils, ET
+from ... import utils
+
+COLOR_ENTRY_RE = re.compile(r"color_entry_list\[(\d+)\]")
+
+# alLayerColor blend modes.
+# Maya keeps the enum value as an index into this list,
+# the name is looked up only when the Katana parameter is written
+BLEND_MODES = [
+    "Normal",
+    "Lighten",
+    "Darken",
+    "Multiply",
+    "Average",
+    "Add",
+    "Subtract",
+    "Difference",
+    "Negation",
+    "Exclusion",
+    "Screen",
+    "Overlay",
+    "Soft Light",
+    "Hard Light",
+    "Color Dodge",
+    "Color Burn",
+    "Linear Dodge",
+    "Linear Burn",
+    "Linear Light",
+    "Vivid Light",
+    "Pin Light",
+    "Hard Mix",
+    "Reflect",
+    "Glow",
+    "Phoenix",
+]
+
+# Coordinate spaces of the projection and noise nodes
+REFERENCE_SPACES = ["world", "object", "Pref"]
+NOISE_SPACES = ["world", "object", "Pref", "UV"]
+TRANSFORM_SPACES = ["world", "object", "camera", "screen", "tangent"]
+
+# Other enum options shared by several parameters
+FRESNEL_MODES = ["dielectric", "metallic"]
+WRAP_MODES = ["periodic", "black", "clamp", "mirror", "file"]
+VOLUME_INTERPOLATIONS = ["closest", "trilinear", "tricubic"]
+VOLUME_SOURCES = ["parameter", "channel"]
+
+# alLayerFloat and alLayerColor layer slots
+LAYER_COUNT = 8
+LAYER_FLOAT_PARAMS = dict.fromkeys(
+    "layer{index}{suffix}".format(index=i, suffix=suffix)
+    for i in range(1, LAYER_COUNT + 1)
+    for suffix in ("", "a")
+)
+LAYER_COLOR_PARAMS = dict(LAYER_FLOAT_PARAMS)
+LAYER_COLOR_PARAMS.update(
+    ("layer{index}blend".format(index=i), BLEND_MODES)
+    for i in range(1, LAYER_COUNT + 1)
+)
+
+# alShaders remap parameters shared by several nodes
+REMAP_PARAMS = dict.fromkeys(
+    [
+        "RMPinputMin",
+        "RMPinputMax",
+        "RMPcontrast",
+        "RMPcontrastPivot",
+        "RMPbias",
+        "RMPgain",
+        "RMPoutputMin",
+        "RMPoutputMax",
+        "RMPclampEnable",
+        "RMPthreshold",
+        "RMPclampMin",
+        "RMPclampMax",
+    ]
+)
+REMAP_NODES = (
+    "alInputScalar",
+    "alCurvature",
+    "alRemapFloat",
+    "alCellNoise",
+    "alFlowNoise",
+    "alFractal",
+)
+
+# Parameter overrides used by override_*_params
+CLAMP_OVERRIDES = {"min": min, "max": max}
+
+HAIR_OVERRIDES = {
+    "dualDepth": 1,
+    "diffuseIndirectStrength": 1,
+    "extraSamplesDiffuse": 2,
+    "extraSamplesGlossy": 2,
+}
+
+MATERIAL_OVERRIDES = {
+    "specular1IndirectClamp": 1,
+    "specular2IndirectClamp": 1,
+    "specular1Distribution": "ggx",
+    "specular2Distribution": "ggx",
+}
+
+# shadingEngine ports to take the surface shader from, by priority
+SURFACE_SHADER_PORTS = (
+    "aiSurfaceShader",
+    "surfaceShader",
+    "aiVolumeShader",
+    "volumeShader",
+)
+
+# NetworkMaterial input ports that are removed if not connected
+NETWORK_MATERIAL_PORTS = ("arnold_surface", "arnoldBump", "arnoldDisplacement")
+
+# Node colors shared between the mappings below
+SHADER_COLOR = (0.2, 0.36, 0.1)
+IMAGE_COLOR = (0.36, 0.25, 0.38)
+LAYER_COLOR = (0.2, 0.56, 0.1)
+MATERIAL_COLOR = (0.4, 0.35, 0.2)
 
 
 def replace_tx(key, filepath):
     """
     Replace all texture paths with their .tx counterparts
     """
-    root, ext = os.path.splitext(filepath)
-    if ext:
-        ext = ".tx"
-    root = root.replace("\\", "/")
-    return root + ext
+    filepath = filepath.replace("\\", "/")
+    name_start = filepath.rfind("/") + 1
+    stem = filepath[name_start:].lstrip(".")
+    # Leading dots of the file name don't start the extension
+    dot = stem.rfind(".")
+    if dot < 0:
+        return filepath
+    return filepath[: len(filepath) - len(stem) + dot] + ".tx"
 
 
 def preprocess_sampler(node):
@@ -54,13 +174,12 @@ def preprocess_sampler(node):
         node_name, source=False, destination=True, connections=True, plugs=True
     )
     if node_connections:
-        for i in range(len(node_connections) / 2):
-            conn_to = node_connections[i * 2]
-            conn_to = conn_to[conn_to.find(".") + 1 :]
-            conn_from = node_connections[i * 2 + 1]
+        for i in range(len(node_connections) // 2):
+            conn_to = node_connections[i * 2].partition(".")[2]
+            conn_from = node_connections[i * 2 + 1].partition(".")
             connections[conn_to] = {
-                "node": conn_from[: conn_from.find(".")],
-                "original_port": conn_from[conn_from.find(".") + 1 :],
+                "node": conn_from[0],
+                "original_port": conn_from[2],
             }
     for connection_name in connections:
         if connection_name == "facingRatio":
@@ -125,19 +244,21 @@ def preprocess_ramp(node):
     node_name = node["name"]
     color_entry_list = {}
     for connection_name, connection in node["connections"].items():
-        colorEntryMatch = re.search(r"color_entry_list\[(\d+)\]", connection_name)
-        if colorEntryMatch:
-            i = int(colorEntryMatch.group(1))
-            color_entry_list[i] = connection
-    # Get the number of ramp points in Maya
-    color_entry_list_size = cmds.getAttr(
-        "{node}.color_entry_list".format(node=node_name), size=True
+        if not connection_name.startswith("color_entry_list["):
+            continue
+        color_entry_match = COLOR_ENTRY_RE.match(connection_name)
+        if color_entry_match:
+            color_entry_list[int(color_entry_match.group(1))] = connection
+    # Get the ramp points in Maya, including the ones without connections
+    color_entry_list_indices = (
+        utils.get_attr(node_name, "color_entry_list", multiIndices=True) or []
     )
+    color_entry_list_size = len(color_entry_list_indices)
     if color_entry_list_size < 2 and color_entry_list:
         # delete the whole ramp as it does nothing in Katana
         if color_entry_list_size == 1:
             # Get the only dictionary value as we know for sure there is one texture input
-            source_connection = color_entry_list.values()[0]
+            source_connection = next(iter(color_entry_list.values()))
             # Here we create a dummy node with no connections,
             # it will be ignored automatically as it's not of known types.
             # But it can be used to perform renames.
@@ -148,34 +269,21 @@ def preprocess_ramp(node):
             }
             nodes[empty_name] = empty_node
         return nodes
-    color_entry_list_size = len(color_entry_list)
-    if color_entry_list_size > 0 and color_entry_list_size <= 2:
+    if 0 < len(color_entry_list) <= 2:
         mix_name = utils.unique_name(node_name + "Mix")
         connections = {
             "mix": {"node": node_name, "original_port": None},
         }
         attributes = {}
-        color_entry_list_indices = cmds.getAttr(
-            node_name + ".color_entry_list", multiIndices=True
+        color_entry_values = utils.get_array_values(
+            node_name, "color_entry_list", children=["color"]
         )
-        i = color_entry_list_indices[0]
-        if color_entry_list.get(i):
-            connections["input1"] = color_entry_list.get(i)
-        else:
-            attributes["input1"] = cmds.getAttr(
-                "{node}.color_entry_list[{index}].{param}".format(
-                    node=node_name, index=i, param="color"
-                )
-            )
-        i = color_entry_list_indices[1]
-        if color_entry_list.get(i):
-            connections["input2"] = color_entry_list.get(i)
-        else:
-            attributes["input2"] = cmds.getAttr(
-                "{node}.color_entry_list[{index}].{param}".format(
-                    node=node_name, index=i, param="color"
-                )
-            )
+        for input_name, i in zip(["input1", "input2"], color_entry_list_indices):
+            connection = color_entry_list.get(i)
+            if connection:
+                connections[input_name] = connection
+            else:
+                attributes[input_name] = color_entry_values[i][0]
         mix = {
             "name": mix_name,
             "type": "mix",
@@ -200,11 +308,9 @@ def preprocess_network_material(node):
     node_name = node["name"]
     connections = node["connections"]
     new_connections = {}
-    for i in ["aiSurfaceShader", "surfaceShader", "aiVolumeShader", "volumeShader"]:
-        connection = connections.get(i)
-        if connection:
-            new_connections["arnold_surface"] = connection
-            break
+    surface_connection = utils.get_first_connection(connections, SURFACE_SHADER_PORTS)
+    if surface_connection:
+        new_connections["arnold_surface"] = surface_connection
     displacement_connection = connections.get("displacementShader")
     if displacement_connection:
         new_connections["arnoldDisplacement"] = displacement_connection
@@ -213,38 +319,44 @@ def preprocess_network_material(node):
     return nodes
 
 
-def postprocess_network_material(node, all_nodes):
+def get_surface_shader_name(node_name, all_nodes):
     """
-    Rename the networkMaterial node and connect bump
+    Follow the AOV writing nodes passthrough to the actual surface shader.
+    Materials often share the same AOV chain so the result is cached
     """
-    nodes = {}
-    arnold_surface = node["connections"].get("arnold_surface")
-    if arnold_surface:
-        shader_node = all_nodes.get(arnold_surface["node"])
+    shader_names = utils.get_cache("surface_shader_name")
+    if node_name not in shader_names:
+        shader_name = node_name
+        shader_node = all_nodes.get(shader_name)
         while shader_node and shader_node.get("type") in [
             "aov_write_rgb",
             "aov_write_float",
         ]:
             passthrough = shader_node["connections"].get("beauty")
-            if passthrough:
-                shader_node = all_nodes.get(passthrough.get("node"))
+            if not passthrough:
+                break
+            shader_name = passthrough.get("node")
+            shader_node = all_nodes.get(shader_name)
+        shader_names[node_name] = shader_name
+    return shader_names[node_name]
+
+
+def postprocess_network_material(node, all_nodes):
+    """
+    Rename the networkMaterial node and connect bump
+    """
+    nodes = {}
+    arnold_surface = node["connections"].get("arnold_surface")
+    if arnold_surface:
+        shader_node = all_nodes.get(
+            get_surface_shader_name(arnold_surface["node"], all_nodes)
+        )
         if shader_node:
-            shader_node_name = shader_node["name"]
-            # Remove the output node to reinsert it back with the new name
-            all_nodes.pop(shader_node_name, None)
-            material_name = shader_node_name
-            shader_node_name += "_out"
-            shader_node["name"] = shader_node_name
-            nodes[shader_node_name] = shader_node
-            node["name"] = material_name
-            node["renamings"] = {
-                material_name: {"name": shader_node_name},
-            }
+            nodes = utils.rename_material(node, shader_node, all_nodes)
             bump = shader_node["connections"].get("normalCamera")
             if bump:
                 node["connections"]["arnoldBump"] = bump
                 del shader_node["connections"]["normalCamera"]
-            nodes[material_name] = node
     return nodes
 
 
@@ -252,10 +364,7 @@ def process_network_material(xml_group, node):
     """
     Process NetworkMaterial to remove extra input ports
     """
-    for i in ["arnold_surface", "arnoldBump", "arnoldDisplacement"]:
-        if i not in node["connections"]:
-            parameter = xml_group.find("./port[@name='{param}']".format(param=i))
-            xml_group.remove(parameter)
+    utils.remove_unconnected_ports(xml_group, node, NETWORK_MATERIAL_PORTS)
 
 
 def process_ramp(xml_group, node):
@@ -298,43 +407,38 @@ def process_ramp(xml_group, node):
         ramp_type = "custom"
     key_value = "color" if node_type == "ramp" else "value"
     interpolation = 0 if attributes["interpolation"] == 0 else 2
-    color_entry_list_size = cmds.getAttr(
-        "{node}.color_entry_list".format(node=node_name), size=True
-    )
     color_entry_list = []
-    has_connections = False
     color_entry_list_indices = sorted(
-        cmds.getAttr(node_name + ".color_entry_list", multiIndices=True)
+        utils.get_attr(node_name, "color_entry_list", multiIndices=True) or []
+    )
+    color_entry_list_size = len(color_entry_list_indices)
+    # A connected entry always exists in the multi indices
+    # so the connection names are checked without building any plug names
+    has_connections = any(
+        key.startswith("color_entry_list[") and key.endswith("].color")
+        for key in connections
+    )
+    # Colors are replaced with indices when there are connections
+    children = ["position"] if has_connections else ["position", "color"]
+    color_entry_values = utils.get_array_values(
+        node_name, "color_entry_list", children=children
     )
-    for i in color_entry_list_indices:
-        if utils.has_connection(
-            node, "color_entry_list[{index}].color".format(index=i)
-        ):
-            has_connections = True
-            break
     index = 0
     for i in color_entry_list_indices:
-        value_position = cmds.getAttr(
-            "{node}.color_entry_list[{index}].{param}".format(
-                node=node_name, index=i, param="position"
-            )
-        )
+        value_position = color_entry_values[i][0]
         if has_connections:
             value_color = index
             index += 1
         else:
-            value_color = cmds.getAttr(
-                "{node}.color_entry_list[{index}].{param}".format(
-                    node=node_name, index=i, param="color"
-                )
-            )
-            value_color = value_color[0]
-        color_entry_list.append({key_value: value_color, "position": value_position})
-    color_entry_list.sort(key=lambda x: x["positions"])
+            value_color = color_entry_values[i][1]
+        color_entry_list.append((value_position, value_color))
+    color_entry_list.sort(key=operator.itemgetter(0))
+    # The first group in document order wins as it would with find()
+    parameters = {}
+    for parameter in xml_group.iter("group_parameter"):
+        parameters.setdefault(parameter.get("name"), parameter)
     for dest_key in ["input", "type", "position", key_value, "interpolation"]:
-        parameter = xml_group.find(
-            ".//group_parameter[@name='{param}']".format(param=dest_key)
-        )
+        parameter = parameters.get(dest_key)
         if parameter is None:
             continue
         enable_node = parameter.find("*[@name='enable']")
@@ -349,17 +453,13 @@ def process_ramp(xml_group, node):
                 value_node.attrib["value"] = value
             continue
         enable_node.attrib["value"] = "1"
-        tuple_size = int(value_node.get("tupleSize", "0"))
-        value_node.attrib["size"] = str(tuple_size * color_entry_list_size)
-        for i in range(color_entry_list_size):
-            if dest_key == "interpolation":
-                value = str(interpolation)
-            else:
-                value = color_entry_list[i][dest_key]
-            for j in range(tuple_size):
-                sub_value = ET.SubElement(value_node, "number_parameter")
-                sub_value.attrib["name"] = "i" + str(i * tuple_size + j)
-                sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
+        if dest_key == "interpolation":
+            values = [interpolation] * color_entry_list_size
+        elif dest_key == "position":
+            values = [position for position, value in color_entry_list]
+        else:
+            values = [value for position, value in color_entry_list]
+        utils.set_number_array(value_node, values)
 
 
 def preprocess_displacement(node):
@@ -388,10 +488,9 @@ def override_clamp_params(key, value):
     """
     Maya has an RGB clamp but Katana uses float value so we need to convert
     """
-    if key == "min":
-        value = min(value)
-    if key == "max":
-        value = max(value)
+    override = CLAMP_OVERRIDES.get(key)
+    if override:
+        value = override(value)
     return value
 
 
@@ -399,26 +498,14 @@ def override_hair_params(key, value):
     """
     Special overrides requested by the artists
     """
-    if key == "dualDepth":
-        value = 1
-    if key == "diffuseIndirectStrength":
-        value = 1
-    if key == "extraSamplesDiffuse":
-        value = 2
-    if key == "extraSamplesGlossy":
-        value = 2
-    return value
+    return HAIR_OVERRIDES.get(key, value)
 
 
 def override_material_params(key, value):
     """
     Special overrides requested by the artists
     """
-    if key == "specular1IndirectClamp" or key == "specular2IndirectClamp":
-        value = 1
-    if key == "specular1Distribution" or key == "specular2Distribution":
-        value = "ggx"
-    return value
+    return MATERIAL_OVERRIDES.get(key, value)
 
 
 # Preprocess keywords:
@@ -476,7 +563,7 @@ premap = {
 # - customProcess
 mappings = {
     "alSurface": {
-        "customColor": (0.2, 0.36, 0.1),
+        "customColor": SHADER_COLOR,
         "diffuseStrength": {
             "diffuseColor": None,
             "diffuseRoughness": None,
@@ -505,7 +592,7 @@ mappings = {
             "specular1Roughness": None,
             "specular1Anisotropy": None,
             "specular1Rotation": None,
-            "specular1FresnelMode": ["dielectric", "metallic"],
+            "specular1FresnelMode": FRESNEL_MODES,
             "specular1Ior": None,
             "specular1Reflectivity": None,
             "specular1EdgeTint": None,
@@ -525,7 +612,7 @@ mappings = {
             "specular2Roughness": None,
             "specular2Anisotropy": None,
             "specular2Rotation": None,
-            "specular2FresnelMode": ["dielectric", "metallic"],
+            "specular2FresnelMode": FRESNEL_MODES,
             "specular2Ior": None,
             "specular2Reflectivity": None,
             "specular2EdgeTint": None,
@@ -565,7 +652,7 @@ mappings = {
         "opacity": None,
     },
     "standard": {
-        "customColor": (0.2, 0.36, 0.1),
+        "customColor": SHADER_COLOR,
         "Kd": {
             "color": "Kd_color",
             "diffuseRoughness": "diffuse_roughness",
@@ -617,7 +704,7 @@ mappings = {
         "opacity": None,
     },
     "volume_collector": {
-        "scatteringSource": ("scattering_source", ["parameter", "channel"]),
+        "scatteringSource": ("scattering_source", VOLUME_SOURCES),
         "scatteringChannel": "scattering_channel",
         "scattering": None,
         "scatteringColor": "scattering_color",
@@ -632,18 +719,18 @@ mappings = {
         "attenuationColor": "attenuation_color",
         "attenuationIntensity": "attenuation_intensity",
         "attenuationMode": ("attenuation_mode", ["absorption", "extinction"]),
-        "emissionSource": ("emission_source", ["parameter", "channel"]),
+        "emissionSource": ("emission_source", VOLUME_SOURCES),
         "emissionChannel": "emission_channel",
         "emission": None,
         "emissionColor": "emission_color",
         "emissionIntensity": "emission_intensity",
         "positionOffset": "position_offset",
-        "interpolation": ["closest", "trilinear", "tricubic"],
+        "interpolation": VOLUME_INTERPOLATIONS,
     },
     "volume_sample_float": {
         "channel": None,
         "positionOffset": "position_offset",
-        "interpolation": ["closest", "trilinear", "tricubic"],
+        "interpolation": VOLUME_INTERPOLATIONS,
         "inputMin": "input_min",
         "inputMax": "input_max",
         "contrast": None,
@@ -658,7 +745,7 @@ mappings = {
     "volume_sample_rgb": {
         "channel": None,
         "positionOffset": "position_offset",
-        "interpolation": ["closest", "trilinear", "tricubic"],
+        "interpolation": VOLUME_INTERPOLATIONS,
         "gamma": None,
         "hueShift": "hue_shift",
         "saturation": None,
@@ -670,7 +757,7 @@ mappings = {
     },
     "luminance": {"value": "input",},
     "image": {
-        "customColor": (0.36, 0.25, 0.38),
+        "customColor": IMAGE_COLOR,
         "filename": replace_tx,
         "filter": ["closest", "bilinear", "bicubic", "smart_bicubic"],
         "mipmapBias": "mipmap_bias",
@@ -684,8 +771,8 @@ mappings = {
         "uvcoords": None,
         "soffset": None,
         "toffset": None,
-        "swrap": ["periodic", "black", "clamp", "mirror", "file"],
-        "twrap": ["periodic", "black", "clamp", "mirror", "file"],
+        "swrap": WRAP_MODES,
+        "twrap": WRAP_MODES,
         "sscale": None,
         "tscale": None,
         "sflip": None,
@@ -729,18 +816,6 @@ mappings = {
             "User",
         ],
         "userName": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
     },
     "alInputVector": {
         "input": [
@@ -770,18 +845,6 @@ mappings = {
         "samples": None,
         "sampleRadius": None,
         "traceSet": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "color1": None,
         "color2": None,
     },
@@ -796,258 +859,8 @@ mappings = {
         "clamp": None,
         "signal": None,
     },
-    "alLayerColor": {
-        "layer1": None,
-        "layer1a": None,
-        "layer1blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer2": None,
-        "layer2a": None,
-        "layer2blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer3": None,
-        "layer3a": None,
-        "layer3blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer4": None,
-        "layer4a": None,
-        "layer4blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer5": None,
-        "layer5a": None,
-        "layer5blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer6": None,
-        "layer6a": None,
-        "layer6blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer7": None,
-        "layer7a": None,
-        "layer7blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer8": None,
-        "layer8a": None,
-        "layer8blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-    },
-    "alLayerFloat": {
-        "layer1": None,
-        "layer1a": None,
-        "layer2": None,
-        "layer2a": None,
-        "layer3": None,
-        "layer3a": None,
-        "layer4": None,
-        "layer4a": None,
-        "layer5": None,
-        "layer5a": None,
-        "layer6": None,
-        "layer6a": None,
-        "layer7": None,
-        "layer7a": None,
-        "layer8": None,
-        "layer8a": None,
-    },
+    "alLayerColor": LAYER_COLOR_PARAMS,
+    "alLayerFloat": LAYER_FLOAT_PARAMS,
     "alSwitchColor": {
         "inputA": None,
         "inputB": None,
@@ -1073,10 +886,10 @@ mappings = {
         "threshold": None,
     },
     "alTriplanar": {
-        "customColor": (0.36, 0.25, 0.38),
+        "customColor": IMAGE_COLOR,
         "input": None,
         "texture": replace_tx,
-        "space": ["world", "object", "Pref"],
+        "space": REFERENCE_SPACES,
         "normal": ["geometric", "smooth", "smooth-NoBump"],
         "tiling": ["regular", "cellnoise"],
         "frequency": None,
@@ -1109,22 +922,10 @@ mappings = {
     },
     "alRemapFloat": {
         "input": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "mask": None,
     },
     "alLayer": {
-        "customColor": (0.2, 0.56, 0.1),
+        "customColor": LAYER_COLOR,
         "layer1": None,
         "layer2": None,
         "mix": None,
@@ -1146,7 +947,7 @@ mappings = {
         #'vCoord': 'input',
     },
     "alHair": {
-        "customColor": (0.2, 0.36, 0.1),
+        "customColor": SHADER_COLOR,
         "melanin": None,
         "dyeColor": None,
         "specularWidth": None,
@@ -1203,7 +1004,7 @@ mappings = {
     },
     "bump2d": {"bumpValue": "bump_map", "bumpDepth": "bump_height",},
     "networkMaterial": {
-        "customColor": (0.4, 0.35, 0.2),
+        "customColor": MATERIAL_COLOR,
         "customProcess": process_network_material,
     },
     "mix": {
@@ -1224,27 +1025,15 @@ mappings = {
         "amplitude": None,
         "scale": None,
         "offset": None,
-        "coordSpace": ("coord_space", ["world", "object", "Pref"]),
+        "coordSpace": ("coord_space", REFERENCE_SPACES),
     },
     "alCellNoise": {
-        "space": ["world", "object", "Pref", "UV"],
+        "space": NOISE_SPACES,
         "frequency": None,
         "mode": ["features", "chips"],
         "randomness": None,
         "octaves": None,
         "lacunarity": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "color1": None,
         "color2": None,
         "smoothChips": None,
@@ -1269,7 +1058,7 @@ mappings = {
         "P": None,
     },
     "alFlowNoise": {
-        "space": ["world", "object", "Pref", "UV"],
+        "space": NOISE_SPACES,
         "frequency": None,
         "octaves": None,
         "lacunarity": None,
@@ -1277,25 +1066,13 @@ mappings = {
         "angle": None,
         "advection": None,
         "turbulent": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "color1": None,
         "color2": None,
         "P": None,
     },
     "alFractal": {
         "mode": ["scalar", "vector"],
-        "space": ["world", "object", "Pref", "UV"],
+        "space": NOISE_SPACES,
         "scale": None,
         "frequency": None,
         "time": None,
@@ -1304,18 +1081,6 @@ mappings = {
         "lacunarity": None,
         "gain": None,
         "turbulent": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "color1": None,
         "color2": None,
         "P": None,
@@ -1329,8 +1094,8 @@ mappings = {
         "invert_y": None,
         "invert_z": None,
         "color_to_signed": None,
-        "from": ["world", "object", "camera", "screen", "tangent"],
-        "to": ["world", "object", "camera", "screen", "tangent"],
+        "from": TRANSFORM_SPACES,
+        "to": TRANSFORM_SPACES,
         "tangent": None,
         "set_normal": None,
     },
@@ -1356,3 +1121,11 @@ mappings = {
         "aovName": "aov_name",
     },
 }
+
+for node_type in REMAP_NODES:
+    mappings[node_type].update(REMAP_PARAMS)
+del node_type
+
+# The tables are never modified after import
+premap = utils.MappingProxyType(premap)
+mappings = utils.MappingProxyType(mappings)
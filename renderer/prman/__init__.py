@@ -25,11 +25,42 @@
 
 import os
 import re
-
-import maya.cmds as cmds
+import collections
 
 from ... import utils, ET
 
+UTILITY_PATTERN_RE = re.compile(r"^utilityPattern\[(\d+)\]$")
+
+# Old ramp attribute patterns translated for the ramps with colorRamp
+NEW_RAMP_ATTRS = utils.MappingProxyType(
+    {r"^colors\[(\d+)\]$": r"^colorRamp\[(\d+)\]\.colorRamp_Color$"}
+)
+# Color of a ramp knot that has no color element
+DEFAULT_RAMP_COLOR = (0.0, 0.0, 0.0)
+
+# shadingEngine ports to take the shaders from, by priority
+SURFACE_SHADER_PORTS = ("rman__surface", "surfaceShader", "volumeShader")
+DISPLACEMENT_SHADER_PORTS = ("rman__displacement", "displacementShader")
+
+# NetworkMaterial input ports that are removed if not connected
+NETWORK_MATERIAL_PORTS = (
+    "prmanBxdf",
+    "prmanDisplacement",
+    "prmanDisplayfilter",
+    "prmanIntegrator",
+    "prmanLight",
+    "prmanLightfilter",
+    "prmanPattern",
+    "prmanProjection",
+    "prmanSamplefilter",
+    "prmanCoshaders.coshader",
+)
+
+# Node colors shared between the mappings below
+SHADER_COLOR = (0.2, 0.36, 0.1)
+IMAGE_COLOR = (0.36, 0.25, 0.38)
+MATERIAL_COLOR = (0.4, 0.35, 0.2)
+
 
 def replace_tex(key, filepath):
     """
@@ -50,22 +81,29 @@ def preprocess_utility_pattern(node):
     node_name = node["name"]
     connections = node["connections"]
     utility_patterns = {}
-    for i in connections:
-        utility_match = re.search(r"^utilityPattern\[(\d+)\]$", i)
+    other_connections = {}
+    for connection_name, connection in connections.items():
+        utility_match = None
+        # Most connections are not utility patterns, skip them cheaply
+        if connection_name.startswith("utilityPattern["):
+            utility_match = UTILITY_PATTERN_RE.match(connection_name)
         if not utility_match:
+            other_connections[connection_name] = connection
             continue
-        utility_patterns[int(utility_match.group(1))] = connections.get(i)
+        utility_patterns[int(utility_match.group(1))] = connection
     nodes[node_name] = node
+    if utility_patterns:
+        # The indexed connections are replaced with a single one
+        connections = node["connections"] = other_connections
     if len(utility_patterns) == 1:
-        connections["utilityPattern"] = utility_patterns.values()[0]
-        del connections["utilityPattern[{}]".format(utility_patterns.keys()[0])]
+        connections["utilityPattern"] = next(iter(utility_patterns.values()))
     elif len(utility_patterns) > 1:
         # We should create a ShadingNodeArrayConnector
         connector_name = utils.unique_name(node_name + "Connector")
-        array_connections = {}
+        # The connector ports follow the insertion order
+        array_connections = collections.OrderedDict()
         for i in sorted(utility_patterns):
             array_connections["i" + str(i)] = utility_patterns.get(i)
-            del connections["utilityPattern[{}]".format(i)]
         connector = {
             "name": connector_name,
             "type": "ShadingNodeArrayConnector",
@@ -89,16 +127,14 @@ def preprocess_network_material(node):
     node_name = node["name"]
     connections = node["connections"]
     new_connections = {}
-    for i in ["rman__surface", "surfaceShader", "volumeShader"]:
-        connection = connections.get(i)
-        if connection:
-            new_connections["prmanBxdf"] = connection
-            break
-    for i in ["rman__displacement", "displacementShader"]:
-        connection = connections.get(i)
-        if connection:
-            new_connections["prmanDisplacement"] = connection
-            break
+    surface_connection = utils.get_first_connection(connections, SURFACE_SHADER_PORTS)
+    if surface_connection:
+        new_connections["prmanBxdf"] = surface_connection
+    displacement_connection = utils.get_first_connection(
+        connections, DISPLACEMENT_SHADER_PORTS
+    )
+    if displacement_connection:
+        new_connections["prmanDisplacement"] = displacement_connection
     nodes[node_name] = node
     node["connections"] = new_connections
     return nodes
@@ -113,18 +149,7 @@ def postprocess_network_material(node, all_nodes):
     if prman_surface:
         shader_node = all_nodes.get(prman_surface["node"])
         if shader_node:
-            shader_node_name = shader_node["name"]
-            # Remove the output node to reinsert it back with the new name
-            all_nodes.pop(shader_node_name, None)
-            material_name = shader_node_name
-            shader_node_name += "_out"
-            shader_node["name"] = shader_node_name
-            nodes[shader_node_name] = shader_node
-            node["name"] = material_name
-            node["renamings"] = {
-                material_name: {"name": shader_node_name},
-            }
-            nodes[material_name] = node
+            nodes = utils.rename_material(node, shader_node, all_nodes)
     return nodes
 
 
@@ -132,21 +157,7 @@ def process_network_material(xml_group, node):
     """
     Process NetworkMaterial to remove extra input ports
     """
-    for i in [
-        "prmanBxdf",
-        "prmanDisplacement",
-        "prmanDisplayfilter",
-        "prmanIntegrator",
-        "prmanLight",
-        "prmanLightfilter",
-        "prmanPattern",
-        "prmanProjection",
-        "prmanSamplefilter",
-        "prmanCoshaders.coshader",
-    ]:
-        if i not in node["connections"]:
-            parameter = xml_group.find("./port[@name='{param}']".format(param=i))
-            xml_group.remove(parameter)
+    utils.remove_unconnected_ports(xml_group, node, NETWORK_MATERIAL_PORTS)
 
 
 def preprocess_displacement(node):
@@ -160,22 +171,52 @@ def preprocess_displacement(node):
     return nodes
 
 
+def has_color_ramp(node_name):
+    """
+    Check if the ramp has the newer colorRamp attribute.
+    The result is cached for the duration of the conversion
+    """
+    color_ramps = utils.get_cache("has_color_ramp")
+    if node_name not in color_ramps:
+        color_ramps[node_name] = utils.has_attribute(node_name, "colorRamp")
+    return color_ramps[node_name]
+
+
 def get_ramp_attr(node_name, attr):
     """
     Translate the old attribute names if needed
     """
-    if cmds.attributeQuery("colorRamp", node=node_name, exists=True):
-        new_ramp_attributes = {
-            r"^colors\[(\d+)\]$": r"^colorRamp\[(\d+)\]\.colorRamp_Color$",
-            "colors[{index}]": "colorRamp[{index}].colorRamp_Color",
-            "{node}.colors[{index}]": "{node}.colorRamp[{index}].colorRamp_Color",
-            "{node}.positions[{index}]": "{node}.colorRamp[{index}].colorRamp_Position",
-            "{node}.positions": "{node}.colorRamp",
-        }
-        attr = new_ramp_attributes.get(attr, attr)
+    if has_color_ramp(node_name):
+        attr = NEW_RAMP_ATTRS.get(attr, attr)
     return attr
 
 
+def get_ramp_indices(node_name):
+    """
+    Get the sorted ramp knot indices.
+    The query is cached so that preprocess_ramp and process_ramp share it
+    """
+    ramp_attr = "colorRamp" if has_color_ramp(node_name) else "positions"
+    return sorted(utils.get_attr(node_name, ramp_attr, multiIndices=True) or [])
+
+
+def get_ramp_values(node_name):
+    """
+    Read all the ramp knots at once.
+    Returns a dictionary of (position, color) tuples by knot index
+    """
+    if has_color_ramp(node_name):
+        return utils.get_array_values(
+            node_name, "colorRamp", children=["colorRamp_Position", "colorRamp_Color"]
+        )
+    positions = utils.get_array_values(node_name, "positions")
+    colors = utils.get_array_values(node_name, "colors")
+    return {
+        i: (position, colors.get(i, DEFAULT_RAMP_COLOR))
+        for i, position in positions.items()
+    }
+
+
 def preprocess_ramp(node):
     """
     Preprocess ramp
@@ -187,14 +228,12 @@ def preprocess_ramp(node):
     connections = node["connections"]
     attributes = node["attributes"]
     colors = {}
-    color_entry_list_size = cmds.getAttr(
-        get_ramp_attr(node_name, "{node}.positions").format(node=node_name), size=True
-    )
+    colors_re = re.compile(get_ramp_attr(node_name, r"^colors\[(\d+)\]$"))
+    other_connections = {}
     for connection_name, connection in connections.items():
-        colors_match = re.search(
-            get_ramp_attr(node_name, r"^colors\[(\d+)\]$"), connection_name
-        )
+        colors_match = colors_re.match(connection_name)
         if not colors_match:
+            other_connections[connection_name] = connection
             continue
         i = int(colors_match.group(1))
         connection["weight"] = i
@@ -202,20 +241,19 @@ def preprocess_ramp(node):
     attributes["useNewRamp"] = 0
     nodes[node_name] = node
     if colors:
+        # The color connections are moved to the connector
+        connections = node["connections"] = other_connections
         # We should create a ShadingNodeArrayConnector
         connector_name = utils.unique_name(node_name + "Connector")
-        array_connections = {}
-        for i in range(color_entry_list_size):
+        # The connector ports follow the insertion order
+        array_connections = collections.OrderedDict()
+        ramp_values = get_ramp_values(node_name)
+        for i in get_ramp_indices(node_name):
             connection = colors.get(i)
             # We need to create a PxrHSL node for color knots
             if not connection:
                 hsl_name = utils.unique_name(node_name + "HSL" + str(i))
-                value_color = cmds.getAttr(
-                    get_ramp_attr(node_name, "{node}.colors[{index}]").format(
-                        node=node_name, index=i
-                    )
-                )
-                value_color = value_color[0]
+                value_color = ramp_values.get(i, (0.0, DEFAULT_RAMP_COLOR))[1]
                 hsl = {
                     "name": hsl_name,
                     "type": "PxrHSL",
@@ -230,10 +268,6 @@ def preprocess_ramp(node):
                     "original_port": "resultRGB",
                 }
             array_connections["i" + str(i)] = connection
-            if i in colors:
-                del connections[
-                    get_ramp_attr(node_name, "colors[{index}]").format(index=i)
-                ]
         connector = {
             "name": connector_name,
             "type": "ShadingNodeArrayConnector",
@@ -260,28 +294,12 @@ def process_ramp(xml_group, node):
     node_type = node["type"]
     if not node_type:
         return
-    color_entry_list_size = cmds.getAttr(
-        get_ramp_attr(node_name, "{node}.positions").format(node=node_name), size=True
-    )
     color_entry_list = []
-    color_entry_list_indices = sorted(
-        cmds.getAttr(
-            get_ramp_attr(node_name, "{node}.positions").format(node=node_name),
-            multiIndices=True,
-        )
-    )
+    color_entry_list_indices = get_ramp_indices(node_name)
+    color_entry_list_size = len(color_entry_list_indices)
+    ramp_values = get_ramp_values(node_name)
     for i in color_entry_list_indices:
-        value_position = cmds.getAttr(
-            get_ramp_attr(node_name, "{node}.positions[{index}]").format(
-                node=node_name, index=i
-            )
-        )
-        value_color = cmds.getAttr(
-            get_ramp_attr(node_name, "{node}.colors[{index}]").format(
-                node=node_name, index=i
-            )
-        )
-        value_color = value_color[0]
+        value_position, value_color = ramp_values[i]
         color_entry_list.append({"colors": value_color, "positions": value_position})
     color_entry_list.sort(key=lambda x: x["positions"])
     for dest_key in ["positions", "colors"]:
@@ -293,14 +311,8 @@ def process_ramp(xml_group, node):
         enable_node = parameter.find("*[@name='enable']")
         value_node = parameter.find("*[@name='value']")
         enable_node.attrib["value"] = "1"
-        tuple_size = int(value_node.get("tupleSize", "0"))
-        value_node.attrib["size"] = str(tuple_size * color_entry_list_size)
-        for i in range(color_entry_list_size):
-            value = color_entry_list[i][dest_key]
-            for j in range(tuple_size):
-                sub_value = ET.SubElement(value_node, "number_parameter")
-                sub_value.attrib["name"] = "i" + str(i * tuple_size + j)
-                sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
+        values = [color_entry_list[i][dest_key] for i in range(color_entry_list_size)]
+        utils.set_number_array(value_node, values)
 
 
 def override_manifold_2d_params(key, value):
@@ -331,327 +343,222 @@ def process_array_connector(xml_group, node):
     """
     Process ArrayConnector connections
     """
+    # The connections are ordered by the index when preprocessing
     connections = node["connections"]
-    for connection_name in sorted(connections):
+    for connection_name in connections:
         in_port = ET.SubElement(xml_group, "port")
         in_port.attrib["name"] = connection_name
         in_port.attrib["type"] = "in"
 
 
+# RenderMan nodes in an alphabetical order
+NODE_TYPES = [
+    "aaOceanPrmanShader",
+    "PxrAdjustNormal",
+    "PxrAovLight",
+    "PxrAttribute",
+    "PxrBackgroundDisplayFilter",
+    "PxrBackgroundSampleFilter",
+    "PxrBakePointCloud",
+    "PxrBakeTexture",
+    "PxrBarnLightFilter",
+    "PxrBlack",
+    "PxrBlackBody",
+    "PxrBlend",
+    "PxrBlockerLightFilter",
+    "PxrBump",
+    "PxrBumpManifold2D",
+    "PxrCamera",
+    "PxrChecker",
+    "PxrClamp",
+    "PxrColorCorrect",
+    "PxrCombinerLightFilter",
+    "PxrConstant",
+    "PxrCookieLightFilter",
+    "PxrCopyAOVDisplayFilter",
+    "PxrCopyAOVSampleFilter",
+    "PxrCross",
+    "PxrCryptomatte",
+    "PxrCurvature",
+    "PxrDebugShadingContext",
+    "PxrDefault",
+    "PxrDiffuse",
+    "PxrDirectLighting",
+    "PxrDirt",
+    "PxrDiskLight",
+    "PxrDisney",
+    "PxrDisplace",
+    "PxrDispScalarLayer",
+    "PxrDispTransform",
+    "PxrDispVectorLayer",
+    "PxrDisplayFilterCombiner",
+    "PxrDistantLight",
+    "PxrDomeLight",
+    "PxrDot",
+    "PxrEdgeDetect",
+    "PxrEnvDayLight",
+    "PxrExposure",
+    "PxrFacingRatio",
+    "PxrFilmicTonemapperDisplayFilter",
+    "PxrFilmicTonemapperSampleFilter",
+    "PxrFlakes",
+    "PxrFractal",
+    "PxrFractalize",
+    "PxrGamma",
+    "PxrGeometricAOVs",
+    "PxrGlass",
+    "PxrGoboLightFilter",
+    "PxrGradeDisplayFilter",
+    "PxrGradeSampleFilter",
+    "PxrHSL",
+    "PxrHair",
+    "PxrHairColor",
+    "PxrHalfBufferErrorFilter",
+    "PxrImageDisplayFilter",
+    "PxrImagePlaneFilter",
+    "PxrIntMultLightFilter",
+    "PxrInvert",
+    "PxrLMDiffuse",
+    "PxrLMGlass",
+    "PxrLMLayer",
+    "PxrLMMetal",
+    "PxrLMMixer",
+    "PxrLMPlastic",
+    "PxrLMSubsurface",
+    "PxrLayer",
+    "PxrLayerMixer",
+    "PxrLayerSurface",
+    "PxrLayeredBlend",
+    "PxrLayeredTexture",
+    "PxrLightEmission",
+    "PxrLightProbe",
+    "PxrLightSaturation",
+    "PxrManifold2D",
+    "PxrManifold3D",
+    "PxrManifold3DN",
+    "PxrMarschnerHair",
+    "PxrMatteID",
+    "PxrMeshLight",
+    "PxrMix",
+    "PxrMultiTexture",
+    "PxrNormalMap",
+    "PxrOcclusion",
+    "PxrPathTracer",
+    "PxrPortalLight",
+    "PxrPrimvar",
+    "PxrProjectionLayer",
+    "PxrProjectionStack",
+    "PxrProjector",
+    "PxrPtexture",
+    "PxrRamp",
+    "PxrRampLightFilter",
+    "PxrRandomTextureManifold",
+    "PxrRectLight",
+    "PxrRemap",
+    "PxrRodLightFilter",
+    "PxrRollingShutter",
+    "PxrRoundCube",
+    "PxrSeExpr",
+    "PxrShadedSide",
+    "PxrShadowDisplayFilter",
+    "PxrShadowFilter",
+    "PxrSkin",
+    "PxrSphereLight",
+    "PxrSurface",
+    "PxrTangentField",
+    "PxrTee",
+    "PxrTexture",
+    "PxrThinFilm",
+    "PxrThreshold",
+    "PxrTileManifold",
+    "PxrToFloat",
+    "PxrToFloat3",
+    "PxrVariable",
+    "PxrVary",
+    "PxrVolume",
+    "PxrVoronoise",
+    "PxrWhitePointDisplayFilter",
+    "PxrWhitePointSampleFilter",
+    "PxrWorley",
+]
+
+# Settings of the nodes that need no special treatment
+EMPTY = utils.MappingProxyType({})
+
 # Preprocess keywords:
 # - preprocess
 # - postprocess (postprocess at level 0)
 # - type (override type)
-premap = {
-    # Maya shading engine node
-    "shadingEngine": {
-        "type": "networkMaterial",
-        "preprocess": preprocess_network_material,
-        "postprocess": postprocess_network_material,
-    },
-    # RenderMan nodes in an alphabetical order
-    "aaOceanPrmanShader": {},
-    "PxrAdjustNormal": {},
-    "PxrAovLight": {},
-    "PxrAttribute": {},
-    "PxrBackgroundDisplayFilter": {},
-    "PxrBackgroundSampleFilter": {},
-    "PxrBakePointCloud": {},
-    "PxrBakeTexture": {},
-    "PxrBarnLightFilter": {},
-    "PxrBlack": {},
-    "PxrBlackBody": {},
-    "PxrBlend": {},
-    "PxrBlockerLightFilter": {},
-    "PxrBump": {},
-    "PxrBumpManifold2D": {},
-    "PxrCamera": {},
-    "PxrChecker": {},
-    "PxrClamp": {},
-    "PxrColorCorrect": {},
-    "PxrCombinerLightFilter": {},
-    "PxrConstant": {},
-    "PxrCookieLightFilter": {},
-    "PxrCopyAOVDisplayFilter": {},
-    "PxrCopyAOVSampleFilter": {},
-    "PxrCross": {},
-    "PxrCryptomatte": {},
-    "PxrCurvature": {},
-    "PxrDebugShadingContext": {},
-    "PxrDefault": {},
-    "PxrDiffuse": {},
-    "PxrDirectLighting": {},
-    "PxrDirt": {},
-    "PxrDiskLight": {},
-    "PxrDisney": {},
-    "PxrDisplace": {"preprocess": preprocess_displacement,},
-    "PxrDispScalarLayer": {},
-    "PxrDispTransform": {},
-    "PxrDispVectorLayer": {},
-    "PxrDisplayFilterCombiner": {},
-    "PxrDistantLight": {},
-    "PxrDomeLight": {},
-    "PxrDot": {},
-    "PxrEdgeDetect": {},
-    "PxrEnvDayLight": {},
-    "PxrExposure": {},
-    "PxrFacingRatio": {},
-    "PxrFilmicTonemapperDisplayFilter": {},
-    "PxrFilmicTonemapperSampleFilter": {},
-    "PxrFlakes": {},
-    "PxrFractal": {},
-    "PxrFractalize": {},
-    "PxrGamma": {},
-    "PxrGeometricAOVs": {},
-    "PxrGlass": {},
-    "PxrGoboLightFilter": {},
-    "PxrGradeDisplayFilter": {},
-    "PxrGradeSampleFilter": {},
-    "PxrHSL": {},
-    "PxrHair": {},
-    "PxrHairColor": {},
-    "PxrHalfBufferErrorFilter": {},
-    "PxrImageDisplayFilter": {},
-    "PxrImagePlaneFilter": {},
-    "PxrIntMultLightFilter": {},
-    "PxrInvert": {},
-    "PxrLMDiffuse": {},
-    "PxrLMGlass": {},
-    "PxrLMLayer": {},
-    "PxrLMMetal": {},
-    "PxrLMMixer": {},
-    "PxrLMPlastic": {},
-    "PxrLMSubsurface": {},
-    "PxrLayer": {},
-    "PxrLayerMixer": {},
-    "PxrLayerSurface": {"preprocess": preprocess_utility_pattern,},
-    "PxrLayeredBlend": {},
-    "PxrLayeredTexture": {},
-    "PxrLightEmission": {},
-    "PxrLightProbe": {},
-    "PxrLightSaturation": {},
-    "PxrManifold2D": {},
-    "PxrManifold3D": {},
-    "PxrManifold3DN": {},
-    "PxrMarschnerHair": {},
-    "PxrMatteID": {},
-    "PxrMeshLight": {},
-    "PxrMix": {},
-    "PxrMultiTexture": {},
-    "PxrNormalMap": {},
-    "PxrOcclusion": {},
-    "PxrPathTracer": {},
-    "PxrPortalLight": {},
-    "PxrPrimvar": {},
-    "PxrProjectionLayer": {},
-    "PxrProjectionStack": {},
-    "PxrProjector": {},
-    "PxrPtexture": {},
-    "PxrRamp": {"preprocess": preprocess_ramp,},
-    "PxrRampLightFilter": {},
-    "PxrRandomTextureManifold": {},
-    "PxrRectLight": {},
-    "PxrRemap": {},
-    "PxrRodLightFilter": {},
-    "PxrRollingShutter": {},
-    "PxrRoundCube": {},
-    "PxrSeExpr": {},
-    "PxrShadedSide": {},
-    "PxrShadowDisplayFilter": {},
-    "PxrShadowFilter": {},
-    "PxrSkin": {},
-    "PxrSphereLight": {},
-    "PxrSurface": {"preprocess": preprocess_utility_pattern,},
-    "PxrTangentField": {},
-    "PxrTee": {},
-    "PxrTexture": {},
-    "PxrThinFilm": {},
-    "PxrThreshold": {},
-    "PxrTileManifold": {},
-    "PxrToFloat": {},
-    "PxrToFloat3": {},
-    "PxrVariable": {},
-    "PxrVary": {},
-    "PxrVolume": {},
-    "PxrVoronoise": {},
-    "PxrWhitePointDisplayFilter": {},
-    "PxrWhitePointSampleFilter": {},
-    "PxrWorley": {},
-}
+premap = dict.fromkeys(NODE_TYPES, EMPTY)
+premap.update(
+    {
+        # Maya shading engine node
+        "shadingEngine": {
+            "type": "networkMaterial",
+            "preprocess": preprocess_network_material,
+            "postprocess": postprocess_network_material,
+        },
+        "PxrDisplace": {"preprocess": preprocess_displacement,},
+        "PxrLayerSurface": {"preprocess": preprocess_utility_pattern,},
+        "PxrRamp": {"preprocess": preprocess_ramp,},
+        "PxrSurface": {"preprocess": preprocess_utility_pattern,},
+    }
+)
 
 # Mappings keywords:
 # - customColor
 # - customProcess
 # - customMapping
-mappings = {
-    "networkMaterial": {
-        "customColor": (0.4, 0.35, 0.2),
-        "customProcess": process_network_material,
-    },
-    "aaOceanPrmanShader": {},
-    "PxrAdjustNormal": {},
-    "PxrAovLight": {},
-    "PxrAttribute": {},
-    "PxrBackgroundDisplayFilter": {},
-    "PxrBackgroundSampleFilter": {},
-    "PxrBakePointCloud": {},
-    "PxrBakeTexture": {},
-    "PxrBarnLightFilter": {},
-    "PxrBlack": {},
-    "PxrBlackBody": {},
-    "PxrBlend": {},
-    "PxrBlockerLightFilter": {},
-    "PxrBump": {},
-    "PxrBumpManifold2D": {},
-    "PxrCamera": {},
-    "PxrChecker": {},
-    "PxrClamp": {},
-    "PxrColorCorrect": {},
-    "PxrCombinerLightFilter": {},
-    "PxrConstant": {},
-    "PxrCookieLightFilter": {},
-    "PxrCopyAOVDisplayFilter": {},
-    "PxrCopyAOVSampleFilter": {},
-    "PxrCross": {},
-    "PxrCryptomatte": {},
-    "PxrCurvature": {},
-    "PxrDebugShadingContext": {},
-    "PxrDefault": {},
-    "PxrDiffuse": {},
-    "PxrDirectLighting": {},
-    "PxrDirt": {},
-    "PxrDiskLight": {},
-    "PxrDisney": {},
-    "PxrDisplace": {},
-    "PxrDispScalarLayer": {},
-    "PxrDispTransform": {},
-    "PxrDispVectorLayer": {},
-    "PxrDisplayFilterCombiner": {},
-    "PxrDistantLight": {},
-    "PxrDomeLight": {},
-    "PxrDot": {},
-    "PxrEdgeDetect": {},
-    "PxrEnvDayLight": {},
-    "PxrExposure": {},
-    "PxrFacingRatio": {},
-    "PxrFilmicTonemapperDisplayFilter": {},
-    "PxrFilmicTonemapperSampleFilter": {},
-    "PxrFlakes": {},
-    "PxrFractal": {},
-    "PxrFractalize": {},
-    "PxrGamma": {},
-    "PxrGeometricAOVs": {},
-    "PxrGlass": {},
-    "PxrGoboLightFilter": {},
-    "PxrGradeDisplayFilter": {},
-    "PxrGradeSampleFilter": {},
-    "PxrHSL": {},
-    "PxrHair": {},
-    "PxrHairColor": {},
-    "PxrHalfBufferErrorFilter": {},
-    "PxrImageDisplayFilter": {},
-    "PxrImagePlaneFilter": {},
-    "PxrIntMultLightFilter": {},
-    "PxrInvert": {},
-    "PxrLMDiffuse": {},
-    "PxrLMGlass": {},
-    "PxrLMLayer": {},
-    "PxrLMMetal": {},
-    "PxrLMMixer": {},
-    "PxrLMPlastic": {},
-    "PxrLMSubsurface": {},
-    "PxrLayer": {"customMapping": False, "customColor": (0.2, 0.36, 0.1),},
-    "PxrLayerMixer": {},
-    "PxrLayerSurface": {"customMapping": False, "customColor": (0.2, 0.36, 0.1),},
-    "PxrLayeredBlend": {},
-    "PxrLayeredTexture": {
-        "customMapping": False,
-        "customColor": (0.36, 0.25, 0.38),
-        "filename": replace_tex,
-    },
-    "PxrLightEmission": {},
-    "PxrLightProbe": {},
-    "PxrLightSaturation": {},
-    "PxrManifold2D": {
-        "customMapping": False,
-        "primvarS": override_manifold_2d_params,
-        "primvarT": override_manifold_2d_params,
-    },
-    "PxrManifold3D": {},
-    "PxrManifold3DN": {},
-    "PxrMarschnerHair": {},
-    "PxrMatteID": {},
-    "PxrMeshLight": {},
-    "PxrMix": {},
-    "PxrMultiTexture": {
-        "customMapping": False,
-        "customColor": (0.36, 0.25, 0.38),
-        "filename0": replace_tex,
-        "filename1": replace_tex,
-        "filename2": replace_tex,
-        "filename3": replace_tex,
-        "filename4": replace_tex,
-        "filename5": replace_tex,
-        "filename6": replace_tex,
-        "filename7": replace_tex,
-        "filename8": replace_tex,
-        "filename9": replace_tex,
-    },
-    "PxrNormalMap": {},
-    "PxrOcclusion": {},
-    "PxrPathTracer": {},
-    "PxrPortalLight": {},
-    "PxrPrimvar": {"customMapping": False, "varname": override_primvar_cs,},
-    "PxrProjectionLayer": {},
-    "PxrProjectionStack": {},
-    "PxrProjector": {},
-    "PxrPtexture": {"customMapping": False, "customColor": (0.36, 0.25, 0.38),},
-    "PxrRamp": {
-        "customProcess": process_ramp,
-        "rampType": None,
-        "useNewRamp": None,
-        "tile": None,
-        # 'positions': None,
-        # 'colors': None,
-        "reverse": None,
-        "basis": None,
-        "splineMap": None,
-        "randomSource": None,
-        "randomSeed": None,
-        "manifold": None,
-    },
-    "PxrRampLightFilter": {},
-    "PxrRandomTextureManifold": {},
-    "PxrRectLight": {},
-    "PxrRemap": {},
-    "PxrRodLightFilter": {},
-    "PxrRollingShutter": {},
-    "PxrRoundCube": {},
-    "PxrSeExpr": {},
-    "PxrShadedSide": {},
-    "PxrShadowDisplayFilter": {},
-    "PxrShadowFilter": {},
-    "PxrSkin": {},
-    "PxrSphereLight": {},
-    "PxrSurface": {"customMapping": False, "customColor": (0.2, 0.36, 0.1),},
-    "PxrTangentField": {},
-    "PxrTee": {},
-    "PxrTexture": {
-        "customMapping": False,
-        "customColor": (0.36, 0.25, 0.38),
-        "filename": replace_tex,
-    },
-    "PxrThinFilm": {},
-    "PxrThreshold": {},
-    "PxrTileManifold": {},
-    "PxrToFloat": {},
-    "PxrToFloat3": {},
-    "PxrVariable": {},
-    "PxrVary": {},
-    "PxrVolume": {},
-    "PxrVoronoise": {},
-    "PxrWhitePointDisplayFilter": {},
-    "PxrWhitePointSampleFilter": {},
-    "PxrWorley": {},
-    "ShadingNodeArrayConnector": {"customProcess": process_array_connector,},
-}
+mappings = dict.fromkeys(NODE_TYPES, EMPTY)
+mappings.update(
+    {
+        "networkMaterial": {
+            "customColor": MATERIAL_COLOR,
+            "customProcess": process_network_material,
+        },
+        "PxrLayer": {"customMapping": False, "customColor": SHADER_COLOR,},
+        "PxrLayerSurface": {"customMapping": False, "customColor": SHADER_COLOR,},
+        "PxrLayeredTexture": {
+            "customMapping": False,
+            "customColor": IMAGE_COLOR,
+            "filename": replace_tex,
+        },
+        "PxrManifold2D": {
+            "customMapping": False,
+            "primvarS": override_manifold_2d_params,
+            "primvarT": override_manifold_2d_params,
+        },
+        "PxrMultiTexture": dict(
+            (("filename{index}".format(index=i), replace_tex) for i in range(10)),
+            customMapping=False,
+            customColor=IMAGE_COLOR,
+        ),
+        "PxrPrimvar": {"customMapping": False, "varname": override_primvar_cs,},
+        "PxrPtexture": {"customMapping": False, "customColor": IMAGE_COLOR,},
+        "PxrRamp": {
+            "customProcess": process_ramp,
+            "rampType": None,
+            "useNewRamp": None,
+            "tile": None,
+            # 'positions': None,
+            # 'colors': None,
+            "reverse": None,
+            "basis": None,
+            "splineMap": None,
+            "randomSource": None,
+            "randomSeed": None,
+            "manifold": None,
+        },
+        "PxrSurface": {"customMapping": False, "customColor": SHADER_COLOR,},
+        "PxrTexture": {
+            "customMapping": False,
+            "customColor": IMAGE_COLOR,
+            "filename": replace_tex,
+        },
+        "ShadingNodeArrayConnector": {"customProcess": process_array_connector,},
+    }
+)
+
+# The tables are never modified after import
+premap = utils.MappingProxyType(premap)
+mappings = utils.MappingProxyType(mappings)
@@ -26,18 +26,35 @@
 import re
 import logging
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from . import ET
+
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2 has no read-only dictionary view, a plain copy is used instead
+    MappingProxyType = dict
 
 log = logging.getLogger("clip")
 
+# Maya queries cached for the duration of a single conversion
+cache = {}
+
+# Katana output ports by Maya output port, see get_out_port()
+out_ports = {}
+OUT_COMPONENT_RE = re.compile(r"^out(?:Color|Value)([RGBAXYZ])")
+
 
-def node_attributes(node):
+def node_attributes(node, node_type=None):
     """
-    Get Maya node attributes
+    Get Maya node attributes.
+    The node type is queried unless it is already known
     """
     attributes = cmds.listAttr(node)
     attr = {}
     attr["node_name"] = node
-    attr["node_type"] = cmds.nodeType(node)
+    attr["node_type"] = node_type or cmds.nodeType(node)
     for attribute in attributes:
         if "." in attribute:
             continue
@@ -49,14 +66,88 @@ def node_attributes(node):
     return attr
 
 
+def get_cache(name):
+    """
+    Get a named cache dictionary that is valid until reset_cache() is called
+    """
+    return cache.setdefault(name, {})
+
+
+def reset_cache():
+    """
+    Drop all cached Maya queries.
+    Should be called before each conversion as the scene may have changed
+    """
+    cache.clear()
+
+
+def get_attr(node_name, attr, **kwargs):
+    """
+    Cached cmds.getAttr
+    """
+    attr_cache = get_cache("get_attr")
+    key = (node_name, attr, tuple(sorted(kwargs.items())))
+    if key not in attr_cache:
+        attr_cache[key] = cmds.getAttr(node_name + "." + attr, **kwargs)
+    return attr_cache[key]
+
+
+def has_attribute(node_name, attr):
+    """
+    Check if the node has the attribute.
+    Unlike cmds.attributeQuery this doesn't go through the command engine
+    """
+    selection = om.MSelectionList()
+    selection.add(node_name)
+    return om.MFnDependencyNode(selection.getDependNode(0)).hasAttribute(attr)
+
+
+def get_array_values(node_name, attr, children=None):
+    """
+    Read all the elements of an array attribute at once.
+    Returns a dictionary of element values by their logical indices.
+    If children are specified, each value is a tuple
+    of the requested child attribute values
+    """
+    selection = om.MSelectionList()
+    selection.add(node_name + "." + attr)
+    plug = selection.getPlug(0)
+    child_attributes = []
+    if children:
+        dependency_node = om.MFnDependencyNode(plug.node())
+        child_attributes = [dependency_node.attribute(child) for child in children]
+    values = {}
+    for i in range(plug.evaluateNumElements()):
+        element = plug.elementByPhysicalIndex(i)
+        if child_attributes:
+            value = tuple(
+                get_plug_value(element.child(child_attribute))
+                for child_attribute in child_attributes
+            )
+        else:
+            value = get_plug_value(element)
+        values[element.logicalIndex()] = value
+    return values
+
+
+def get_plug_value(plug):
+    """
+    Get numeric plug value.
+    Compound plugs (like colors) are returned as tuples
+    """
+    if plug.isCompound:
+        return tuple(get_plug_value(plug.child(i)) for i in range(plug.numChildren()))
+    return plug.asDouble()
+
+
 def unique_name(name=None, reset=False):
     """
     Create a unique node name by appending A-Z letters
     """
     if not hasattr(unique_name, "usedNames") or reset is True:
-        unique_name.usedNames = []
+        unique_name.usedNames = set()
     if isinstance(reset, list):
-        unique_name.usedNames = list(reset)
+        unique_name.usedNames = set(reset)
     if name in unique_name.usedNames:
         if name[-1] > "Z":
             name = name + "A"
@@ -65,7 +156,7 @@ def unique_name(name=None, reset=False):
             if c > "Z":
                 c = "AA"
             name = name[:-1] + c
-    unique_name.usedNames.append(name)
+    unique_name.usedNames.add(name)
     return name
 
 
@@ -75,19 +166,30 @@ def get_out_connection(connection):
     """
     if not connection:
         return ""
-    out_port = [strip_namespace(connection["node"])]
-    if connection.get("original_port").startswith(("outDisplacement", "outEigenvalue")):
-        out_port.append(connection.get("original_port"))
-    elif connection.get("original_port").startswith("out"):
-        out_port.append("out")
-    else:
-        out_port.append(connection.get("original_port"))
-    original_port = re.findall(
-        r"^out(?:Color|Value)([RGBAXYZ])", connection.get("original_port") or ""
+    return (
+        strip_namespace(connection["node"])
+        + "."
+        + get_out_port(connection.get("original_port"))
     )
-    if original_port:
-        out_port.append(original_port[0].lower())
-    return ".".join(out_port)
+
+
+def get_out_port(original_port):
+    """
+    Translate Maya output port to Katana.
+    The results are memoized as the same few ports are used all over
+    """
+    if original_port not in out_ports:
+        if original_port.startswith(("outDisplacement", "outEigenvalue")):
+            out_port = [original_port]
+        elif original_port.startswith("out"):
+            out_port = ["out"]
+        else:
+            out_port = [original_port]
+        component = OUT_COMPONENT_RE.findall(original_port)
+        if component:
+            out_port.append(component[0].lower())
+        out_ports[original_port] = ".".join(out_port)
+    return out_ports[original_port]
 
 
 def rename_connections(nodes):
@@ -135,6 +237,62 @@ def has_connection(node, param):
     return param in node["connections"]
 
 
+def get_first_connection(connections, port_names):
+    """
+    Get the first existing connection of the listed ports
+    """
+    return next((connections[i] for i in port_names if connections.get(i)), None)
+
+
+def rename_material(node, shader_node, all_nodes):
+    """
+    Give the shadingEngine node the name of its shader
+    and rename the shader to "<name>_out".
+    Returns both renamed nodes
+    """
+    shader_node_name = shader_node["name"]
+    # Remove the output node to reinsert it back with the new name
+    all_nodes.pop(shader_node_name, None)
+    material_name = shader_node_name
+    shader_node_name += "_out"
+    shader_node["name"] = shader_node_name
+    node["name"] = material_name
+    node["renamings"] = {
+        material_name: {"name": shader_node_name},
+    }
+    return {shader_node_name: shader_node, material_name: node}
+
+
+def remove_unconnected_ports(xml_group, node, port_names):
+    """
+    Remove the listed input ports that have no connections
+    """
+    connections = node["connections"]
+    for port in xml_group.findall("./port"):
+        port_name = port.get("name")
+        if port_name in port_names and port_name not in connections:
+            xml_group.remove(port)
+
+
+def set_number_array(value_node, values):
+    """
+    Fill the Katana number array parameter with the values.
+    Tuple values are flattened to match the array tuple size
+    """
+    tuple_size = int(value_node.get("tupleSize", "0"))
+    value_node.attrib["size"] = str(tuple_size * len(values))
+    if tuple_size > 1:
+        values = [value[j] for value in values for j in range(tuple_size)]
+    elif not tuple_size:
+        values = []
+    value_node.extend(
+        [
+            ET.Element("number_parameter", name="i" + str(i), value=str(value))
+            for i, value in enumerate(values)
+        ]
+    )
+
+
 def strip_namespace(name):
     """
     Strip all namespaces.